@@ -0,0 +1,184 @@
+"""
+Client Overhead Microbenchmarks
+Measures the per-call overhead of APIClient URL building, response logging, retry logging and validators
+without a server. Results can be saved and compared against a saved baseline:
+
+    python -m benchmarks.client_overhead --save test-results/benchmarks/baseline.json
+    python -m benchmarks.client_overhead --compare test-results/benchmarks/baseline.json
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urljoin
+
+import requests
+from urllib3 import HTTPResponse
+
+from helpers import validator
+from helpers.api_client import APIClient, LoggingRetry
+
+BASE_URI = "http://localhost:3000"
+BASE_PATH = "/api/books"
+LOG_FORMAT = "%(asctime)s [%(threadName)s] [%(levelname)s] %(message)s"
+DEFAULT_RESULTS_PATH = "test-results/benchmarks/client-overhead.json"
+BOOK = {"id": 10, "title": "Book Title 10", "author": "Book Author 10"}
+URL_ENDPOINTS = (None, "/", "/search", "/reset", "/10", "/invalid-string", "/search?title=x")
+
+
+def legacy_build_url(base_url: str, base_path: str, endpoint: str = None) -> str:
+    """Reference implementation of APIClient.build_url before precomputation."""
+    endpoint = endpoint.lstrip("/") if endpoint else ""
+    return urljoin(base_url.rstrip("/") + "/", f"{base_path.rstrip('/')}/{endpoint}")
+
+
+def make_response(body, status_code: int = 200) -> requests.Response:
+    """Build a completed requests.Response without a server."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = f"{BASE_URI}{BASE_PATH}"
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response.raw = io.BytesIO(json.dumps(body).encode())
+    response.request = requests.Request(
+        "GET", response.url, headers={"authorization": "Bearer user-token"}
+    ).prepare()
+    return response
+
+
+def loaded(response: requests.Response) -> requests.Response:
+    """Read the response body, as requests does for non-streamed requests."""
+    _ = response.content
+    return response
+
+
+def build_benchmarks() -> dict:
+    """Benchmark name -> zero argument callable."""
+    client = APIClient(BASE_URI, BASE_PATH)
+    for endpoint in URL_ENDPOINTS:
+        expected = legacy_build_url(BASE_URI, BASE_PATH, endpoint)
+        if client.build_url(endpoint) != expected:
+            raise AssertionError(f"build_url({endpoint!r}) != {expected}")
+
+    book_response = loaded(make_response(BOOK, 201))
+    error_response = loaded(make_response({"error": "Book not found"}, 404))
+    books_body = [dict(BOOK, id=book_id) for book_id in range(1, 1001)]
+    retry = LoggingRetry(total=3, status_forcelist=[503], allowed_methods=["GET"])
+    retry_response = HTTPResponse(status=503, preload_content=False)
+
+    return {
+        "build_url[/search]": lambda: client.build_url("/search"),
+        "build_url[/{id}]": lambda: client.build_url("/10"),
+        "legacy_build_url[/search]": lambda: legacy_build_url(BASE_URI, BASE_PATH, "/search"),
+        "legacy_build_url[/{id}]": lambda: legacy_build_url(BASE_URI, BASE_PATH, "/10"),
+        "log_response": lambda: client.log_response(book_response),
+        "log_response[stream]": lambda: client.log_response(book_response, stream=True),
+        "LoggingRetry.increment": lambda: retry.increment(
+            method="GET", url=BASE_PATH, response=retry_response
+        ),
+        "validate_status_code": lambda: validator.validate_status_code(book_response, 201),
+        "validate_response_book": lambda: validator.validate_response_book(book_response, BOOK),
+        "validate_error_message": lambda: validator.validate_error_message(
+            error_response, "Book not found"
+        ),
+        "response.json[1000 books]": lambda: make_response(books_body).json(),
+        "count_json_array_items[1000 books]": lambda: validator.count_json_array_items(
+            make_response(books_body)
+        ),
+    }
+
+
+def run(benchmarks: dict, repeat: int, min_time: float) -> dict:
+    """Time each benchmark, per call ns as median and min of repeats."""
+    results = {}
+    for name, func in benchmarks.items():
+        timer = timeit.Timer(func)
+        loops, elapsed = timer.autorange()
+        loops = max(1, int(loops * min_time / max(elapsed, 1e-9)))
+        timings = [t / loops * 1e9 for t in timer.repeat(repeat=repeat, number=loops)]
+        results[name] = {
+            "perCallNs": round(statistics.median(timings), 1),
+            "minNs": round(min(timings), 1),
+            "loops": loops,
+        }
+        print(f"{name:<40} {results[name]['perCallNs']:>14,.1f} ns/call")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print change against the baseline, returns benchmarks slower than threshold percent."""
+    regressions = []
+    print(f"\n{'Benchmark':<40} {'Baseline ns':>14} {'Current ns':>14} {'Change':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base_ns = baseline[name]["perCallNs"]
+        change = (result["perCallNs"] - base_ns) / base_ns * 100
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = " REGRESSION"
+        print(f"{name:<40} {base_ns:>14,.1f} {result['perCallNs']:>14,.1f} {change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Run the microbenchmarks, save and/or compare results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat")
+    parser.add_argument("--filter", default="", help="Run benchmarks whose name contains this")
+    parser.add_argument(
+        "--log-level", default="INFO", help="Log level while benchmarking (pytest.ini uses INFO)"
+    )
+    parser.add_argument("--save", nargs="?", const=DEFAULT_RESULTS_PATH, help="Save results JSON")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=25.0, help="Regression threshold in percent"
+    )
+    args = parser.parse_args(argv)
+
+    # Log records are formatted as in a test run, but written to devnull
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logging.basicConfig(level=args.log_level, handlers=[handler], force=True)
+        benchmarks = {
+            name: func for name, func in build_benchmarks().items() if args.filter in name
+        }
+        results = run(benchmarks, args.repeat, args.min_time)
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as out:
+            json.dump(
+                {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "requests": requests.__version__,
+                    "logLevel": args.log_level,
+                    "results": results,
+                },
+                out,
+                indent=4,
+            )
+        print(f"\nResults saved: {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
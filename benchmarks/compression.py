@@ -0,0 +1,124 @@
+"""
+Compression Benchmark
+Compares latency, throughput and payload size of GET /api/books with compression on and off for growing
+page sizes (limit), against a running Book API:
+
+    python -m benchmarks.compression --base-uri http://localhost:3000 --seed 1000 --save
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from helpers.api_client import ACCEPT_ENCODING, APIClient
+
+BASE_PATH = "/api/books"
+HEADERS = {"authorization": "Bearer user-token"}
+DEFAULT_RESULTS_PATH = "test-results/benchmarks/compression.json"
+
+
+def seed_books(client: APIClient, count: int):
+    """Create benchmark books until the catalogue holds at least count books."""
+    existing = len(client.get(client.build_url()).json())
+    for index in range(existing, count):
+        client.post(
+            client.build_url(),
+            json={
+                "title": f"Compression Benchmark Book Title {index}",
+                "author": f"Compression Benchmark Book Author {index}",
+            },
+            headers=HEADERS,
+        )
+    print(f"Catalogue size: {max(existing, count)} books")
+
+
+def measure(client: APIClient, limit: int, requests_count: int) -> dict:
+    """Request one page of limit books requests_count times and aggregate the payload stats."""
+    latencies, stats = [], []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        response = client.get(client.build_url(), params={"limit": limit, "page": 1})
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        stats.append(response.payload_stats)
+    total_seconds = sum(latencies) / 1000
+    wire_bytes = statistics.median(stat["wireBytes"] for stat in stats)
+    decoded_bytes = statistics.median(stat["decodedBytes"] for stat in stats)
+    return {
+        "encoding": stats[-1]["encoding"],
+        "medianLatencyInMs": round(statistics.median(latencies), 3),
+        "p95LatencyInMs": round(statistics.quantiles(latencies, n=20)[-1], 3),
+        "requestsPerSecond": round(requests_count / total_seconds, 1),
+        "decodedMBPerSecond": round(sum(s["decodedBytes"] for s in stats) / total_seconds / 1e6, 3),
+        "wireBytes": int(wire_bytes),
+        "decodedBytes": int(decoded_bytes),
+        "compressionRatio": round(decoded_bytes / wire_bytes, 2) if wire_bytes else None,
+        "medianDecodeTimeInMs": round(statistics.median(s["decodeTimeInMs"] for s in stats), 3),
+    }
+
+
+def main(argv=None) -> int:
+    """Run the compression benchmark and print / save the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-uri", default="http://localhost:3000", help="Book API base URI")
+    parser.add_argument(
+        "--limits", default="10,50,100,500,1000", help="Comma separated page sizes (limit)"
+    )
+    parser.add_argument("--requests", type=int, default=20, help="Requests per page size and mode (min 2)")
+    parser.add_argument("--seed", type=int, default=0, help="Create books up to this catalogue size")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_RESULTS_PATH, help="Save results JSON")
+    args = parser.parse_args(argv)
+    if args.requests < 2:
+        parser.error("--requests must be at least 2 to compute the p95 latency")
+    limits = [int(limit) for limit in args.limits.split(",")]
+
+    logging.basicConfig(level=logging.WARNING)
+    clients = {
+        "on": APIClient(args.base_uri, BASE_PATH, compression=True),
+        "off": APIClient(args.base_uri, BASE_PATH, compression=False),
+    }
+    if args.seed:
+        seed_books(clients["off"], args.seed)
+
+    print(f"Accept-Encoding (on): {ACCEPT_ENCODING}\n")
+    print(
+        f"{'limit':>6} {'compression':>11} {'encoding':>9} {'median ms':>10} {'p95 ms':>8} "
+        f"{'req/s':>8} {'wire B':>10} {'decoded B':>10} {'ratio':>6} {'decode ms':>10}"
+    )
+    results = {}
+    for limit in limits:
+        for mode, client in clients.items():
+            result = measure(client, limit, args.requests)
+            results.setdefault(str(limit), {})[mode] = result
+            print(
+                f"{limit:>6} {mode:>11} {result['encoding']:>9} {result['medianLatencyInMs']:>10.2f} "
+                f"{result['p95LatencyInMs']:>8.2f} {result['requestsPerSecond']:>8.1f} "
+                f"{result['wireBytes']:>10} {result['decodedBytes']:>10} "
+                f"{result['compressionRatio'] or '-':>6} {result['medianDecodeTimeInMs']:>10.3f}"
+            )
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as out:
+            json.dump(
+                {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "baseUri": args.base_uri,
+                    "acceptEncoding": ACCEPT_ENCODING,
+                    "requestsPerPoint": args.requests,
+                    "results": results,
+                },
+                out,
+                indent=4,
+            )
+        print(f"\nResults saved: {args.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,15 +4,21 @@ import json
 import logging
 import os
 import shutil
+import time
 from pathlib import Path
+from urllib.parse import urlparse
 
+import allure
 import pytest
+import requests
 from _pytest.python import Function
 from _pytest.reports import TestReport
 from pluggy import Result
 from pytest import Session
 
+from helpers import dataset, targets
 from helpers.api_client import APIClient
+from helpers.dataset_registry import DatasetRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -21,11 +27,15 @@ BASE_PATH = "/api/books"
 
 
 test_results = {}
+target_timings = targets.TargetTimings()
 test_plan_suite = {}
 test_case_mappings = {}
 TEMP_TEST_RESULTS_DIR = Path("test-results-tmp")
+SHARED_DATASETS_DIR = TEMP_TEST_RESULTS_DIR / "shared-datasets"
+FAILURES_PATH = TEMP_TEST_RESULTS_DIR / "failures.log"
 TEST_PLAN_SUITE_PATH = "test-plan-suite.json"
 TEST_RESULTS_PATH = "test-results/test-results-report.json"
+TEST_DATA_DIR = Path(os.getenv("TEST_DATA_DIR", "test-data"))
 
 with open(TEST_PLAN_SUITE_PATH, encoding="utf-8") as f:
     test_plan_suite = json.load(f)
@@ -33,9 +43,252 @@ with open(TEST_PLAN_SUITE_PATH, encoding="utf-8") as f:
 
 
 @pytest.fixture(scope="module")
-def api_client():
-    """API Client Global Fixture"""
-    return APIClient(BASE_URI, BASE_PATH)
+def api_client(request):
+    """
+    API Client Global Fixture
+    Spreads requests across the configured targets, or is bound to a single target per
+    parametrized module with --target-strategy each.
+    """
+    if hasattr(request, "param"):
+        pool = targets.TargetPool([request.param], timings=target_timings)
+    else:
+        pool = targets.TargetPool(
+            get_targets(request.config),
+            request.config.getoption("--target-strategy"),
+            target_timings,
+        )
+    return APIClient(pool.targets[0], BASE_PATH, target_pool=pool)
+
+
+@pytest.fixture(scope="session")
+def shared_datasets():
+    """Shared seeded dataset registry, coordinated across xdist workers"""
+    return DatasetRegistry(SHARED_DATASETS_DIR)
+
+
+def get_targets(config) -> list:
+    """Target base URIs from --base-uri or the comma separated BOOK_API_TARGETS env variable."""
+    return config.getoption("--base-uri") or [
+        target.strip()
+        for target in os.getenv("BOOK_API_TARGETS", BASE_URI).split(",")
+        if target.strip()
+    ]
+
+
+def pytest_addoption(parser):
+    """Register command line options"""
+    parser.addoption(
+        "--base-uri",
+        action="append",
+        default=None,
+        help="Book API target base URI, repeat for several replicas "
+        f"(default: BOOK_API_TARGETS env variable, comma separated, or {BASE_URI})",
+    )
+    parser.addoption(
+        "--target-strategy",
+        choices=targets.STRATEGIES,
+        default=targets.ROUND_ROBIN,
+        help="Spread requests across targets round-robin / least-outstanding, "
+        "or run every test against each target",
+    )
+    parser.addoption(
+        "--ready-timeout",
+        type=float,
+        default=0,
+        help="Seconds to wait for every target to respond before running tests (default 0: disabled)",
+    )
+    parser.addoption(
+        "--fail-fast-threshold",
+        type=int,
+        default=0,
+        help="Stop all xdist workers once this many tests failed across workers (0 to disable)",
+    )
+    parser.addoption(
+        "--tiered",
+        action="store_true",
+        help="Gate on the smoke tier: once a smoke test fails on any worker, skip remaining non-smoke tests",
+    )
+    parser.addoption(
+        "--append-results",
+        action="store_true",
+        help="Merge the test results into an existing test results report (e.g. of a previous smoke run)",
+    )
+    parser.addoption(
+        "--dataset-shards",
+        type=int,
+        default=None,
+        help="Number of hash shards for dataset records (default: number of xdist workers). "
+        "Shards are applied as xdist_group, use with --target-strategy each --dist loadgroup",
+    )
+
+
+def pytest_configure(config):
+    """Clear shared dataset manifests and failures left over by an interrupted run (main process only)."""
+    if hasattr(config, "workerinput"):
+        return
+    if os.path.isdir(SHARED_DATASETS_DIR):
+        shutil.rmtree(SHARED_DATASETS_DIR)
+    if os.path.isfile(FAILURES_PATH):
+        os.remove(FAILURES_PATH)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionstart(session: Session):
+    """
+    Readiness probe (main process only, not with --collect-only): wait until every target responds,
+    instead of a fixed delay. Exits the run when a target is not ready within --ready-timeout seconds.
+    """
+    ready_timeout = session.config.getoption("--ready-timeout")
+    if (
+        hasattr(session.config, "workerinput")
+        or session.config.option.collectonly
+        or not ready_timeout
+    ):
+        return
+    for target in get_targets(session.config):
+        url = APIClient(target, BASE_PATH).build_url()
+        start = time.monotonic()
+        while True:
+            try:
+                response = requests.get(url, params={"page": 1, "limit": 1}, timeout=2)
+                if response.status_code < 500:
+                    logger.info(
+                        "Target ready: %s (%.1fs)", target, time.monotonic() - start
+                    )
+                    break
+                last_error = f"HTTP {response.status_code}"
+            except requests.RequestException as error:
+                last_error = type(error).__name__
+            if time.monotonic() - start > ready_timeout:
+                pytest.exit(
+                    f"Target not ready after {ready_timeout}s: {url} ({last_error})",
+                    returncode=pytest.ExitCode.INTERRUPTED,
+                )
+            time.sleep(0.5)
+
+
+def shared_failures() -> list:
+    """Failures recorded by all xdist workers, one 'smoke|other nodeid' entry per failure."""
+    if not os.path.isfile(FAILURES_PATH):
+        return []
+    with open(FAILURES_PATH, encoding="utf-8") as failures_file:
+        return failures_file.read().splitlines()
+
+
+def record_failure(item: Function):
+    """Record a failed test in the failures log shared by all xdist workers."""
+    TEMP_TEST_RESULTS_DIR.mkdir(exist_ok=True)
+    tier = "smoke" if item.get_closest_marker("smoke") else "other"
+    with open(FAILURES_PATH, "a", encoding="utf-8") as failures_file:
+        failures_file.write(f"{tier} {item.nodeid}\n")
+
+
+def check_fail_fast(item: Function, failures: list) -> bool:
+    """Request this worker to stop once the shared failure threshold is reached."""
+    threshold = item.config.getoption("--fail-fast-threshold")
+    if threshold and len(failures) >= threshold:
+        item.session.shouldstop = (
+            f"Fail-fast: {len(failures)} failures across workers (threshold {threshold})"
+        )
+        return True
+    return False
+
+
+def pytest_runtest_setup(item: Function):
+    """Skip tests once the shared fail-fast threshold is reached or, with --tiered, the smoke tier failed."""
+    tiered = item.config.getoption("--tiered")
+    if not (tiered or item.config.getoption("--fail-fast-threshold")):
+        return
+    failures = shared_failures()
+    if check_fail_fast(item, failures):
+        pytest.skip(item.session.shouldstop)
+    if (
+        tiered
+        and not item.get_closest_marker("smoke")
+        and any(failure.startswith("smoke ") for failure in failures)
+    ):
+        pytest.skip("Tiered: smoke tier failed, skipping non-smoke test")
+
+
+def dataset_shard_count(config) -> int:
+    """Number of dataset shards from --dataset-shards or the xdist worker count."""
+    shard_count = config.getoption("--dataset-shards")
+    if shard_count:
+        return shard_count
+    workerinput = getattr(config, "workerinput", None)
+    return workerinput["workercount"] if workerinput else 1
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc):
+    """
+    Parametrize tests by target with --target-strategy each, and tests marked with
+    @pytest.mark.dataset(file, id_field=None) from a JSONL/CSV dataset.
+    Each record is passed as a lazy reference and only loaded by the dataset_case fixture at run time.
+    """
+    if (
+        "api_client" in metafunc.fixturenames
+        and metafunc.config.getoption("--target-strategy") == targets.EACH
+    ):
+        metafunc.parametrize(
+            "api_client",
+            [
+                pytest.param(
+                    target,
+                    id=urlparse(target).netloc,
+                    marks=pytest.mark.xdist_group(f"target-{urlparse(target).netloc}"),
+                )
+                for target in get_targets(metafunc.config)
+            ],
+            indirect=True,
+            scope="module",
+        )
+
+    marker = metafunc.definition.get_closest_marker("dataset")
+    if marker is None:
+        return
+    records = dataset.iter_records(
+        TEST_DATA_DIR / marker.args[0],
+        id_field=marker.kwargs.get("id_field"),
+        shard_count=dataset_shard_count(metafunc.config),
+    )
+    metafunc.parametrize(
+        "dataset_case",
+        [pytest.param(record, id=str(record)) for record in records],
+        indirect=True,
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items: list):
+    """
+    Assign dataset records to the xdist_group of their hash shard, within the target group with
+    --target-strategy each (target-<netloc>-dataset-<shard>), so the records of a test are spread
+    across workers with --dist loadgroup. Runs before xdist reads the groups.
+    """
+    for item in items:
+        params = item.callspec.params if hasattr(item, "callspec") else {}
+        if "dataset_case" not in params:
+            continue
+        group = f"dataset-{params['dataset_case'].shard}"
+        if "api_client" in params:
+            group = f"target-{urlparse(params['api_client']).netloc}-{group}"
+        item.own_markers = [mark for mark in item.own_markers if mark.name != "xdist_group"]
+        item.add_marker(pytest.mark.xdist_group(group))
+
+
+@pytest.fixture
+def dataset_case(request) -> dict:
+    """
+    Dataset record of the current data-driven iteration
+    Publishes the record fields as Allure parameters in place of the lazy record reference.
+    """
+    record = request.param.load()
+    allure.dynamic.parameter(
+        "dataset_case", repr(request.param), mode=allure.parameter_mode.HIDDEN
+    )
+    for name, value in record.items():
+        allure.dynamic.parameter(name, value)
+    return record
 
 
 def collect_test_results(test_name: str, test_params: str, report: TestReport, call=None):
@@ -80,7 +333,7 @@ def collect_test_results(test_name: str, test_params: str, report: TestReport, c
             "outcome": new_outcome,
             "durationInMs": duration_ms,
             "errorMessage": error_message,
-            "comment": f"DataDriven: Test Parameters: {json.dumps(test_params)}",
+            "comment": f"DataDriven: Test Parameters: {json.dumps(test_params, default=dataset.json_default)}",
         }
         result["iterationDetails"].append(iteration_result)
 
@@ -101,6 +354,47 @@ def collect_test_results(test_name: str, test_params: str, report: TestReport, c
             result["errorMessage"] = error_message
 
 
+def merge_test_results(worker_results: dict):
+    """
+    Merges the test results of an xdist worker into test_results.
+    A test case can run on several workers (e.g. --target-strategy each with --dist loadgroup), its iteration
+    details are appended and renumbered, durations summed and outcomes combined as in collect_test_results.
+    """
+    for test_case_id, worker_result in worker_results.items():
+        result = test_results.get(test_case_id)
+        if result is None:
+            test_results[test_case_id] = worker_result
+            continue
+
+        iteration_errors = []
+        for iteration in worker_result["iterationDetails"]:
+            iteration_id = len(result["iterationDetails"]) + 1
+            if iteration["errorMessage"]:
+                iteration["errorMessage"] = iteration["errorMessage"].replace(
+                    f"Iteration {iteration['id']}: ", f"Iteration {iteration_id}: ", 1
+                )
+                iteration_errors.append(iteration["errorMessage"])
+            iteration["id"] = iteration_id
+            result["iterationDetails"].append(iteration)
+
+        result["durationInMs"] += worker_result["durationInMs"]
+        if result["outcome"] != worker_result["outcome"]:
+            result["outcome"] = "Inconclusive"
+
+        # Data-driven error messages are rebuilt from the renumbered iterations
+        error_message = (
+            "\n".join(iteration_errors)
+            if worker_result["iterationDetails"]
+            else worker_result.get("errorMessage", "")
+        )
+        if error_message:
+            existing_error = result.get("errorMessage", "")
+            if existing_error:
+                result["errorMessage"] = f"{existing_error}\n{error_message}"
+            else:
+                result["errorMessage"] = error_message
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item: Function, call):
     """
@@ -120,6 +414,12 @@ def pytest_runtest_makereport(item: Function, call):
     elif report.when == "setup" and report.outcome in ["failed", "skipped"]:
         collect_test_results(test_name, test_params, report, call)
 
+    if report.failed and report.when in ["setup", "call"] and (
+        item.config.getoption("--tiered") or item.config.getoption("--fail-fast-threshold")
+    ):
+        record_failure(item)
+        check_fail_fast(item, shared_failures())
+
 
 def pytest_sessionfinish(session: Session, exitstatus):
     """
@@ -134,28 +434,52 @@ def pytest_sessionfinish(session: Session, exitstatus):
         TEMP_TEST_RESULTS_DIR.mkdir(exist_ok=True)
         result_file = TEMP_TEST_RESULTS_DIR / f"{worker_id}.json"
         with open(result_file, "w", encoding="utf-8") as temp_file:
-            json.dump(test_results, temp_file, indent=2)
+            json.dump(
+                {"testResults": test_results, "targetTimings": target_timings.as_dict()},
+                temp_file,
+                indent=2,
+            )
+    elif session.config.option.collectonly:
+        logger.info("Collect only: skipping reset and test results report")
     else:
 
-        client = APIClient(BASE_URI, BASE_PATH)
-        res = client.delete(
-            client.build_url("/reset"), headers={"authorization": "Bearer admin-token"}
-        )
+        for target in get_targets(session.config):
+            client = APIClient(target, BASE_PATH)
+            res = client.delete(
+                client.build_url("/reset"), headers={"authorization": "Bearer admin-token"}
+            )
+
+            assert (
+                res.status_code == 204
+            ), f"Reset failed: {target} {res.status_code} {res.text}"  # nosec
 
-        assert (
-            res.status_code == 204
-        ), f"Reset failed: {res.status_code} {res.text}"  # nosec
+        if session.config.getoption("--append-results") and os.path.isfile(TEST_RESULTS_PATH):
+            with open(TEST_RESULTS_PATH, encoding="utf-8") as previous_report_file:
+                previous_report = json.load(previous_report_file)
+                merge_test_results(previous_report["testResults"])
+                target_timings.merge(previous_report.get("targetTimings", {}))
 
         # In the main process — wait for workers to finish and merge their results
-        for temp_file_path in TEMP_TEST_RESULTS_DIR.glob("*.json"):
+        for temp_file_path in sorted(TEMP_TEST_RESULTS_DIR.glob("*.json")):
             with open(temp_file_path, "r", encoding="utf-8") as temp_results_file:
                 worker_data = json.load(temp_results_file)
-                test_results.update(worker_data)
+                merge_test_results(worker_data["testResults"])
+                target_timings.merge(worker_data["targetTimings"])
         report = {
             "testPlanName": test_plan_suite['testPlanName'],
             "testSuiteName": test_plan_suite['testSuiteName'],
-            "testResults": test_results
+            "testResults": test_results,
+            "targetTimings": target_timings.as_dict(),
         }
+        for target, timing in report["targetTimings"].items():
+            logger.info(
+                "Target %s: %s requests, %s failures, avg %s ms, max %s ms",
+                target,
+                timing["requests"],
+                timing["failures"],
+                timing["avgDurationInMs"],
+                timing["maxDurationInMs"],
+            )
 
         with open(TEST_RESULTS_PATH, "w", encoding="utf-8") as out:
             json.dump(report, out, indent=4)
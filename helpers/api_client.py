@@ -1,14 +1,35 @@
 """API Client Utility"""
 
+import copy
+import io
 import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
 from urllib.parse import urljoin
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+from urllib3.exceptions import SSLError as Urllib3SSLError
+from urllib3.util import make_headers
 from urllib3.util.retry import Retry
 
+from helpers.targets import TargetPool
+
 logger = logging.getLogger(__name__)
 
+FIXED_ENDPOINTS = (None, "", "/", "/search", "/reset")
+MAX_URL_CACHE_SIZE = 1024
+# Endpoints (e.g. /{id}) that urljoin resolves to a plain append to the base path
+_APPEND_ENDPOINT = re.compile(r"/?[\w-]*")
+MAP_MAX_WORKERS = 8
+# gzip, deflate and br / zstd when brotli / zstandard are installed
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
 
 class LoggingRetry(Retry):
     """Retry Logger Adapter"""
@@ -41,12 +62,25 @@ class LoggingRetry(Retry):
 class APIClient(requests.Session):
     """Custom API client for building URLs and logging requests/responses."""
 
-    def __init__(self, base_url: str, base_path: str = "", headers: dict = None):
+    def __init__(
+        self,
+        base_url: str,
+        base_path: str = "",
+        headers: dict = None,
+        target_pool: TargetPool = None,
+        compression: bool = True,
+    ):
         super().__init__()
         self.base_url = base_url.rstrip("/") + "/"
         self.base_path = base_path.rstrip("/") + "/" if base_path else ""
+        self.target_pool = target_pool
+        self._url_prefix = urljoin(self.base_url, self.base_path)
+        self._url_cache = {
+            endpoint: self._join_url(endpoint) for endpoint in FIXED_ENDPOINTS
+        }
+        self.headers["Accept-Encoding"] = ACCEPT_ENCODING if compression else "identity"
         self.headers.update(headers or {})
-        self.hooks["response"].append(self.log_response)
+        self.hooks["response"].extend([self.record_payload, self.log_response])
         retries = LoggingRetry(
             total=3,
             status_forcelist=[429, 500, 502, 503, 504],
@@ -60,16 +94,152 @@ class APIClient(requests.Session):
                 "PATCH",
             ],
         )
-        adapter = HTTPAdapter(max_retries=retries)
-        self.mount("https://", adapter)
-        self.mount("http://", adapter)
+        self.retry_adapter = HTTPAdapter(max_retries=retries)
+        self.mount("https://", self.retry_adapter)
+        self.mount("http://", self.retry_adapter)
 
-    def build_url(self, endpoint: str = None) -> str:
-        """Build a full URL for the given endpoint."""
+    def request(self, method, url, *args, **kwargs):
+        """Send the request, to a replica picked by the target pool when one is configured."""
+        if self.target_pool is None or not url.startswith(self.base_url):
+            return super().request(method, url, *args, **kwargs)
+        target = self.target_pool.acquire()
+        failed = True
+        start = time.perf_counter()
+        try:
+            response = super().request(
+                method, target + url[len(self.base_url):], *args, **kwargs
+            )
+            failed = response.status_code >= 500
+            return response
+        finally:
+            self.target_pool.release(
+                target, (time.perf_counter() - start) * 1000, failed
+            )
+
+    def _thread_session(self) -> "APIClient":
+        """
+        Copy of this client for use by a single thread, without the response log hook.
+        Session settings and hooks are copied, the retry adapter is new per thread and any other
+        mounted adapter is shared with this client.
+        """
+        session = APIClient(self.base_url, self.base_path, target_pool=self.target_pool)
+        session.headers = self.headers.copy()
+        session.cookies = self.cookies.copy()
+        session.params = copy.copy(self.params)
+        session.proxies = copy.copy(self.proxies)
+        for name in ("auth", "verify", "cert", "stream", "trust_env", "max_redirects"):
+            setattr(session, name, getattr(self, name))
+        session.hooks = {
+            event: [
+                hook
+                for hook in hooks
+                if getattr(hook, "__func__", None) is not APIClient.log_response
+            ]
+            for event, hooks in self.hooks.items()
+        }
+        for prefix, adapter in self.adapters.items():
+            if adapter is not self.retry_adapter:
+                session.mount(prefix, adapter)
+        return session
+
+    def map(self, request_specs: Iterable, max_workers: int = MAP_MAX_WORKERS) -> list:
+        """
+        Send independent requests concurrently on a bounded thread pool, with one session per thread.
+        Each spec is a (method, url) or (method, url, kwargs) tuple.
+        Responses are returned, and logged, in submission order. When a request raises, the completed
+        responses are closed and the first error in submission order is raised.
+        """
+        specs = [tuple(spec) if len(spec) == 3 else (*spec, {}) for spec in request_specs]
+        if not specs:
+            return []
+        local = threading.local()
+        retry_adapters = []
+
+        def send(spec):
+            method, url, kwargs = spec
+            if not hasattr(local, "session"):
+                local.session = self._thread_session()
+                retry_adapters.append(local.session.retry_adapter)
+            return local.session.request(method, url, **kwargs)
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(specs)),
+                thread_name_prefix="APIClient.map",
+            ) as executor:
+                futures = [executor.submit(send, spec) for spec in specs]
+            errors = [future.exception() for future in futures if future.exception()]
+            if errors:
+                # Release the connections of the completed (e.g. streamed) responses
+                for future in futures:
+                    if not future.exception():
+                        future.result().close()
+                raise errors[0]
+            responses = [future.result() for future in futures]
+        finally:
+            # Only the retry adapters are per thread, the other adapters are shared with this client
+            for retry_adapter in retry_adapters:
+                retry_adapter.close()
+        for (_, _, kwargs), response in zip(specs, responses):
+            self.log_response(response, stream=kwargs.get("stream", False))
+        return responses
+
+    def _join_url(self, endpoint: str = None) -> str:
+        """Join the base URL, base path and endpoint."""
         endpoint = endpoint.lstrip("/") if endpoint else ""
         fullpath = f"{self.base_path}{endpoint}"
         return urljoin(self.base_url, fullpath)
 
+    def build_url(self, endpoint: str = None) -> str:
+        """Build a full URL for the given endpoint, fixed endpoints are precomputed and results memoised."""
+        url = self._url_cache.get(endpoint)
+        if url is None:
+            if _APPEND_ENDPOINT.fullmatch(endpoint):
+                url = self._url_prefix + endpoint.lstrip("/")
+            else:
+                url = self._join_url(endpoint)
+            if len(self._url_cache) < MAX_URL_CACHE_SIZE:
+                self._url_cache[endpoint] = url
+        return url
+
+    def record_payload(self, response: requests.Response, *args, **kwargs):
+        """
+        Read and decode the response body, recording wire bytes, decoded bytes and decode time
+        in response.payload_stats. Streamed responses are left unread (payload_stats is None).
+        """
+        response.payload_stats = None
+        if kwargs.get("stream"):
+            return response
+        encoding = response.headers.get("Content-Encoding", "identity")
+        try:
+            wire_body = response.raw.read(decode_content=False)
+            start = time.perf_counter()
+            body = HTTPResponse(
+                body=io.BytesIO(wire_body),
+                headers={"Content-Encoding": encoding},
+                decode_content=True,
+            ).data
+            decode_time_ms = (time.perf_counter() - start) * 1000
+        except ProtocolError as error:
+            raise requests.exceptions.ChunkedEncodingError(error) from error
+        except DecodeError as error:
+            raise requests.exceptions.ContentDecodingError(error) from error
+        except ReadTimeoutError as error:
+            raise requests.exceptions.ConnectionError(error) from error
+        except Urllib3SSLError as error:
+            raise requests.exceptions.SSLError(error) from error
+        # Same as requests does when reading the content itself
+        response._content = body  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+        response.payload_stats = {
+            "encoding": encoding,
+            "wireBytes": len(wire_body),
+            "decodedBytes": len(body),
+            "decodeTimeInMs": round(decode_time_ms, 3),
+        }
+        logger.debug("Payload: %s", response.payload_stats)
+        return response
+
     def log_response(self, response: requests.Response, *args, **kwargs):
         """Log details of the request and response."""
         logger.debug("Request Headers: %s", response.request.headers)
@@ -81,5 +251,9 @@ class APIClient(requests.Session):
             response.status_code,
         )
         logger.debug("Response Headers: %s", response.headers)
-        logger.debug("Response Body: %s", response.text)
+        if kwargs.get("stream"):
+            # Reading the body here would consume the stream before the caller does
+            logger.debug("Response Body: <streamed>")
+        else:
+            logger.debug("Response Body: %s", response.text)
         return response
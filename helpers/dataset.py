@@ -0,0 +1,89 @@
+"""Dataset Parametrisation Utility"""
+
+import csv
+import json
+import logging
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_SUFFIXES = (".jsonl", ".csv")
+
+
+class DatasetRecord:
+    """
+    Lazy reference to a single record of a JSONL/CSV dataset.
+    Holds only the byte offset of the record line, the record is read from disk on load().
+    """
+
+    __slots__ = ("path", "offset", "line_no", "record_id", "shard")
+
+    def __init__(self, path: Path, offset: int, line_no: int, record_id: str, shard: int):
+        self.path = path
+        self.offset = offset
+        self.line_no = line_no
+        self.record_id = record_id
+        self.shard = shard
+
+    def load(self) -> dict:
+        """Read and decode the record from the dataset file."""
+        with open(self.path, "rb") as dataset_file:
+            header = dataset_file.readline()
+            dataset_file.seek(self.offset)
+            line = dataset_file.readline()
+        return _decode_line(self.path, line, header)
+
+    def __str__(self):
+        return self.record_id
+
+    def __repr__(self):
+        return f"DatasetRecord({self.path.name}:{self.line_no})"
+
+
+def _decode_line(path: Path, line: bytes, header: bytes) -> dict:
+    """Decode a single dataset line into a record dict."""
+    text = line.decode("utf-8")
+    if path.suffix == ".jsonl":
+        return json.loads(text)
+    fieldnames = next(csv.reader([header.decode("utf-8-sig")]))
+    return dict(zip(fieldnames, next(csv.reader([text]))))
+
+
+def shard_of(line: bytes, shard_count: int) -> int:
+    """Deterministic shard index of a record line, stable across processes and runs."""
+    return zlib.crc32(line.strip()) % shard_count if shard_count > 1 else 0
+
+
+def iter_records(path: Path, id_field: str = None, shard_count: int = 1) -> Iterator[DatasetRecord]:
+    """
+    Stream a JSONL/CSV dataset and yield a lazy DatasetRecord per record.
+    One record per line, blank lines are skipped and CSV files must start with a header line.
+    Only the id_field value (if given) is kept in memory, the record itself is dropped after reading.
+    """
+    path = Path(path)
+    if path.suffix not in SUPPORTED_SUFFIXES:
+        raise ValueError(f"Unsupported dataset format '{path.suffix}': {path}")
+    count = 0
+    with open(path, "rb") as dataset_file:
+        header = dataset_file.readline() if path.suffix == ".csv" else b""
+        offset = dataset_file.tell()
+        line_no = 2 if header else 1
+        for line in iter(dataset_file.readline, b""):
+            if line.strip():
+                record_id = f"line{line_no}"
+                if id_field:
+                    record_id = str(_decode_line(path, line, header).get(id_field, record_id))
+                count += 1
+                yield DatasetRecord(path, offset, line_no, record_id, shard_of(line, shard_count))
+            offset += len(line)
+            line_no += 1
+    logger.debug("Dataset %s streamed %s records into %s shards", path, count, shard_count)
+
+
+def json_default(value):
+    """json.dumps default hook resolving DatasetRecord params to their record content."""
+    if isinstance(value, DatasetRecord):
+        return value.load()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
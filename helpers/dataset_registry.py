@@ -0,0 +1,81 @@
+"""Shared Dataset Registry Utility"""
+
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetRegistry:
+    """
+    Cross-process (xdist worker) registry of named seeded datasets.
+    The first process to acquire a dataset seeds it under a file lock and writes a manifest of its records,
+    later acquirers reuse the manifest records read-only. Manifests are kept for the whole run, the seeded data
+    is removed by the end of run /reset.
+    """
+
+    def __init__(self, root: Path, lock_timeout: float = 60, poll_interval: float = 0.05):
+        self.root = Path(root)
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str, suffix: str) -> Path:
+        return self.root / (re.sub(r"[^\w.-]", "_", name) + suffix)
+
+    @contextmanager
+    def _lock(self, name: str):
+        """Exclusive lock on the dataset, held by creating the lock file."""
+        lock_path = self._path(name, ".lock")
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                lock_fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for dataset lock: {lock_path}") from None
+                time.sleep(self.poll_interval)
+        try:
+            os.write(lock_fd, str(os.getpid()).encode())
+            yield
+        finally:
+            os.close(lock_fd)
+            os.remove(lock_path)
+
+    def _read_manifest(self, name: str):
+        manifest_path = self._path(name, ".json")
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path, encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+
+    def _write_manifest(self, name: str, manifest: dict):
+        manifest_path = self._path(name, ".json")
+        temp_path = manifest_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(temp_path, manifest_path)
+
+    def acquire(self, name: str, seed: Callable[[], list]) -> tuple:
+        """
+        Get the records of the named dataset, seeding it with seed() if it does not exist yet.
+        seed must return JSON serializable records (e.g. created IDs), which are returned to every acquirer.
+        """
+        with self._lock(name):
+            manifest = self._read_manifest(name)
+            if manifest is None:
+                logger.info("Seeding shared dataset: %s", name)
+                manifest = {"name": name, "records": seed()}
+                self._write_manifest(name, manifest)
+            else:
+                logger.info(
+                    "Reusing shared dataset: %s (%s records)", name, len(manifest["records"])
+                )
+        return tuple(manifest["records"])
@@ -0,0 +1,100 @@
+"""Target Replica Utility"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round-robin"
+LEAST_OUTSTANDING = "least-outstanding"
+EACH = "each"
+STRATEGIES = (ROUND_ROBIN, LEAST_OUTSTANDING, EACH)
+
+
+def normalize_target(target: str) -> str:
+    """Normalize a target base URL the same way APIClient normalizes base_url."""
+    return target.rstrip("/") + "/"
+
+
+class TargetTimings:
+    """Thread-safe request count and duration (ms) aggregation per target."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def record(self, target: str, duration_ms: float, failed: bool = False):
+        """Record a single request duration against the target."""
+        with self._lock:
+            timing = self._timings.setdefault(
+                target,
+                {"requests": 0, "failures": 0, "totalDurationInMs": 0, "maxDurationInMs": 0},
+            )
+            timing["requests"] += 1
+            timing["failures"] += int(failed)
+            timing["totalDurationInMs"] += duration_ms
+            timing["maxDurationInMs"] = max(timing["maxDurationInMs"], duration_ms)
+
+    def merge(self, timings: dict):
+        """Merge timings from as_dict() of another process (e.g. xdist worker)."""
+        with self._lock:
+            for target, other in timings.items():
+                timing = self._timings.setdefault(
+                    target,
+                    {"requests": 0, "failures": 0, "totalDurationInMs": 0, "maxDurationInMs": 0},
+                )
+                timing["requests"] += other["requests"]
+                timing["failures"] += other["failures"]
+                timing["totalDurationInMs"] += other["totalDurationInMs"]
+                timing["maxDurationInMs"] = max(timing["maxDurationInMs"], other["maxDurationInMs"])
+
+    def as_dict(self) -> dict:
+        """Timings per target with average duration, durations rounded to ms."""
+        with self._lock:
+            return {
+                target: {
+                    "requests": timing["requests"],
+                    "failures": timing["failures"],
+                    "totalDurationInMs": int(timing["totalDurationInMs"]),
+                    "avgDurationInMs": int(timing["totalDurationInMs"] / timing["requests"]),
+                    "maxDurationInMs": int(timing["maxDurationInMs"]),
+                }
+                for target, timing in self._timings.items()
+            }
+
+
+class TargetPool:
+    """Thread-safe selection of target replicas by round-robin or least outstanding requests."""
+
+    def __init__(self, targets: list, strategy: str = ROUND_ROBIN, timings: TargetTimings = None):
+        if not targets:
+            raise ValueError("At least one target is required")
+        if strategy not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ValueError(f"Unsupported target pool strategy '{strategy}'")
+        self.targets = [normalize_target(target) for target in targets]
+        self.strategy = strategy
+        self.timings = timings if timings is not None else TargetTimings()
+        self._lock = threading.Lock()
+        self._next = 0
+        self._outstanding = dict.fromkeys(self.targets, 0)
+
+    def acquire(self) -> str:
+        """Pick the target for the next request and count it as outstanding."""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.targets)
+            if self.strategy == LEAST_OUTSTANDING:
+                # Rotate the start so ties are spread round-robin
+                candidates = self.targets[start:] + self.targets[:start]
+                target = min(candidates, key=self._outstanding.__getitem__)
+            else:
+                target = self.targets[start]
+            self._outstanding[target] += 1
+            return target
+
+    def release(self, target: str, duration_ms: float, failed: bool = False):
+        """Mark the request to target as completed and record its duration."""
+        with self._lock:
+            self._outstanding[target] -= 1
+        self.timings.record(target, duration_ms, failed)
+        logger.debug("Target %s completed in %.1f ms", target, duration_ms)
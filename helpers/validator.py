@@ -1,11 +1,19 @@
 """Validator and Assertion Utility"""
 
+import codecs
+import json
 import logging
+from typing import Any, Callable, Iterator
 
 import requests
 
 logger = logging.getLogger(__name__)
 
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_ITEM_DELIMITERS = tuple(_WHITESPACE + ",]")
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 def _assert_with_log(condition: bool, message: str):
     """Assert with logging for pass/fail."""
@@ -55,3 +63,88 @@ def validate_error_message(response: requests.Response, message: str):
         response.json().get("error") == message,
         f"Error Message: Expected '{message}' Actual '{response.json().get('error')}'",
     )
+
+
+def iter_json_array(
+    response: requests.Response, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Incrementally decode the items of a top-level JSON array response body.
+    Use with stream=True requests, only the current chunk and item are held in memory.
+    """
+    chunks = response.iter_content(chunk_size)
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    buffer, pos, eof = "", 0, False
+    opened, expect_item, empty = False, True, True
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not opened:
+                if char != "[":
+                    raise ValueError(f"Expected JSON array in response body, found '{char}'")
+                opened = True
+                pos += 1
+                continue
+            if char == "]" and (not expect_item or empty):
+                return
+            if not expect_item:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array, found '{char}'")
+                expect_item = True
+                pos += 1
+                continue
+            try:
+                item, end = _JSON_DECODER.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # Numbers cut at a chunk boundary decode partially, so an item only counts once a delimiter follows
+            if end is not None and (eof or buffer[end:end + 1] in _ITEM_DELIMITERS):
+                yield item
+                pos, expect_item, empty = end, False, False
+                continue
+        elif eof:
+            raise ValueError("Incomplete JSON array in response body")
+
+        chunk = next(chunks, None)
+        eof = chunk is None
+        buffer = buffer[pos:] + decoder.decode(chunk or b"", final=eof)
+        pos = 0
+
+
+def validate_json_array_items(
+    response: requests.Response,
+    predicate: Callable[[Any], bool],
+    message: str,
+    fail_fast: bool = True,
+) -> int:
+    """
+    Assert predicate holds for every item of a streamed JSON array response.
+    Stops reading at the first failing item when fail_fast, returns the number of items checked.
+    """
+    count = failures = 0
+    try:
+        for item in iter_json_array(response):
+            count += 1
+            if not predicate(item):
+                failures += 1
+                if fail_fast:
+                    break
+    finally:
+        response.close()
+    _assert_with_log(
+        failures == 0, f"{message} => Items checked: {count} Failed: {failures}"
+    )
+    return count
+
+
+def count_json_array_items(response: requests.Response) -> int:
+    """Count the items of a streamed JSON array response."""
+    try:
+        return sum(1 for _ in iter_json_array(response))
+    finally:
+        response.close()
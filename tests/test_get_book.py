@@ -13,23 +13,20 @@ from tests.base_test import BaseTest
 class TestGetBook(BaseTest):
     """Get Book Test Class"""
 
+    book_ids: tuple
     SEARCH_ENDPOINT = "/search"
     DEFAULT_HEADERS = {"authorization": "Bearer user-token"}
-    NOT_FOUND_MESSAGE = "Books not found for search"
 
     def assert_search_results(self, response, title=None, author=None):
-        """Helper to validate search response and its contents"""
-        validator.validate_status_code(response, 200)
-        books = response.json()
-        if title:
-            validator.assert_true(
-                all(title in book["title"] for book in books),
-                f"All books should contain title '{title}'",
-            )
-        if author:
-            validator.assert_true(
-                all(author.lower() in book["author"].lower() for book in books),
-                f"All books should contain author '{author}'",
+        """Helper to validate streamed search response and its contents"""
+        filters = [f"{name} '{value}'" for name, value in (("title", title), ("author", author)) if value]
+        with response:
+            validator.validate_status_code(response, 200)
+            validator.validate_json_array_items(
+                response,
+                lambda book: (not title or title in book["title"])
+                and (not author or author.lower() in book["author"].lower()),
+                f"All books should contain {' and '.join(filters)}",
             )
 
     @pytest.fixture(scope="class")
@@ -41,53 +38,62 @@ class TestGetBook(BaseTest):
         ]
 
     @pytest.fixture(scope="class", autouse=True)
-    def create_book_before_test(self, init_api_client, get_books):
-        """Class scope fixture to create book before Test"""
-        for book in get_books:
-            response = self.client.post(
-                self.client.build_url(), json=book, headers=self.DEFAULT_HEADERS
+    def create_book_before_test(self, init_api_client, get_books, shared_datasets):
+        """Class scope fixture to create (or reuse the shared) books before Test"""
+        dataset_name = f"get-books-{self.client.base_url}"
+
+        def seed_books():
+            responses = self.client.map(
+                ("POST", self.client.build_url(), {"json": book, "headers": self.DEFAULT_HEADERS})
+                for book in get_books
             )
-            validator.validate_status_code(response, 201)
-            validator.validate_response_book(response, book)
+            for book, response in zip(get_books, responses):
+                validator.validate_status_code(response, 201)
+                validator.validate_response_book(response, book)
+            return [response.json()["id"] for response in responses]
+
+        # Seeded books are reused by every worker / class of this target until the end of run /reset
+        self.__class__.book_ids = shared_datasets.acquire(dataset_name, seed_books)
 
     @pytest.mark.smoke
     @pytest.mark.regression
     @allure.title("Should return books for default page 1")
     def test_should_return_books_for_default_page1(self):
         """Test Should return Book For Default page 1"""
-        response = self.client.get(self.client.build_url())
-        validator.validate_status_code(response, 200)
-        validator.assert_true(
-            len(response.json()) >= 10, "Number Of Books should greater or equal to 10"
-        )
+        with self.client.get(self.client.build_url(), stream=True) as response:
+            validator.validate_status_code(response, 200)
+            validator.assert_true(
+                validator.count_json_array_items(response) >= 10,
+                "Number Of Books should greater or equal to 10",
+            )
 
     @pytest.mark.regression
     @allure.title("Should return books by page number")
     def test_should_return_books_by_page_number(self):
         """Test Should return book by page number"""
-        response = self.client.get(self.client.build_url(), params={"page": 2})
-        validator.validate_status_code(response, 200)
-        validator.assert_true(
-            all(book["id"] >= 10 for book in response.json()),
-            "Page 2 Book ids should greater than 10",
-        )
+        with self.client.get(
+            self.client.build_url(), params={"page": 2}, stream=True
+        ) as response:
+            validator.validate_status_code(response, 200)
+            validator.validate_json_array_items(
+                response,
+                lambda book: book["id"] >= 10,
+                "Page 2 Book ids should greater than 10",
+            )
 
     @pytest.mark.regression
-    @pytest.mark.parametrize(
-        "params,expected_count,message",
-        [
-            ({"limit": 5}, 5, "Books size by limit"),
-            ({"limit": 5, "page": 2}, 5, "Page 2 Book ids should be 5"),
-            ({"page": 3}, 0, "Books size out of page range should be 0"),
-            ({"page": -3}, 0, "Books size with negative page should be 0"),
-        ],
-    )
-    @allure.title("Pagination cases:{message}")
-    def test_pagination_cases(self, params, expected_count, message):
+    @pytest.mark.dataset("pagination_cases.jsonl", id_field="message")
+    @allure.title("Pagination cases:{dataset_case[message]}")
+    def test_pagination_cases(self, dataset_case):
         """Test various pagination scenarios"""
-        response = self.client.get(self.client.build_url(), params=params)
+        response = self.client.get(
+            self.client.build_url(), params=dataset_case["params"]
+        )
         validator.validate_status_code(response, 200)
-        validator.assert_true(len(response.json()) == expected_count, message)
+        validator.assert_true(
+            len(response.json()) == dataset_case["expected_count"],
+            dataset_case["message"],
+        )
 
     @pytest.mark.regression
     @pytest.mark.negative
@@ -105,9 +111,12 @@ class TestGetBook(BaseTest):
     @allure.title("Should return single book by ID")
     def test_should_return_single_book_by_id(self):
         """Test Should return Single Book by ID"""
-        response = self.client.get(self.client.build_url("/10"))
+        book_id = self.book_ids[-1]
+        response = self.client.get(self.client.build_url(f"/{book_id}"))
         validator.validate_status_code(response, 200)
-        validator.assert_equals(response.json()["id"], 10, "Retrieve Book by book ID")
+        validator.assert_equals(
+            response.json()["id"], book_id, "Retrieve Book by book ID"
+        )
 
     @pytest.mark.negative
     @pytest.mark.regression
@@ -131,11 +140,12 @@ class TestGetBook(BaseTest):
     @allure.title("Should return all books when book ID is empty")
     def test_should_return_all_books_when_book_id_is_empty(self):
         """Test should return all books when book id is empty"""
-        response = self.client.get(self.client.build_url("/"))
-        validator.validate_status_code(response, 200)
-        validator.assert_true(
-            len(response.json()) >= 10, "Number Of Books should greater or equal to 10"
-        )
+        with self.client.get(self.client.build_url("/"), stream=True) as response:
+            validator.validate_status_code(response, 200)
+            validator.assert_true(
+                validator.count_json_array_items(response) >= 10,
+                "Number Of Books should greater or equal to 10",
+            )
 
     @pytest.mark.regression
     @allure.title("Should return books containing author")
@@ -144,6 +154,7 @@ class TestGetBook(BaseTest):
         response = self.client.get(
             self.client.build_url(self.SEARCH_ENDPOINT),
             params={"author": "Book Author"},
+            stream=True,
         )
         self.assert_search_results(response, author="Book Author")
 
@@ -152,7 +163,9 @@ class TestGetBook(BaseTest):
     def test_should_return_books_contains_title(self):
         """Test should return book contains title"""
         response = self.client.get(
-            self.client.build_url(self.SEARCH_ENDPOINT), params={"title": "Book Title"}
+            self.client.build_url(self.SEARCH_ENDPOINT),
+            params={"title": "Book Title"},
+            stream=True,
         )
         self.assert_search_results(response, title="Book Title")
 
@@ -163,6 +176,7 @@ class TestGetBook(BaseTest):
         response = self.client.get(
             self.client.build_url(self.SEARCH_ENDPOINT),
             params={"title": "Book Title", "author": "book author"},
+            stream=True,
         )
         self.assert_search_results(response, title="Book Title", author="book author")
 
@@ -173,6 +187,7 @@ class TestGetBook(BaseTest):
         response = self.client.get(
             self.client.build_url(self.SEARCH_ENDPOINT),
             params={"title": "Book Title 7", "author": "book author 7"},
+            stream=True,
         )
         self.assert_search_results(
             response, title="Book Title 7", author="book author 7"
@@ -180,24 +195,12 @@ class TestGetBook(BaseTest):
 
     @pytest.mark.negative
     @pytest.mark.regression
-    @pytest.mark.parametrize(
-        "params,status_code,expected_message",
-        [
-            ({}, 400, "Please provide at least a title or author for search"),
-            (
-                {"title": "Book Title Not Exits", "author": "book author Not Exits"},
-                404,
-                NOT_FOUND_MESSAGE,
-            ),
-            ({"author": "book author Not Exits"}, 404, NOT_FOUND_MESSAGE),
-            ({"title": "Book Title Not Exits"}, 404, NOT_FOUND_MESSAGE),
-        ],
-    )
-    @allure.title("Search error cases: {expected_message}")
-    def test_search_error_cases(self, params, status_code, expected_message):
+    @pytest.mark.dataset("search_error_cases.jsonl")
+    @allure.title("Search error cases: {dataset_case[expected_message]}")
+    def test_search_error_cases(self, dataset_case):
         """Test various error scenarios for book search"""
         response = self.client.get(
-            self.client.build_url(self.SEARCH_ENDPOINT), params=params
+            self.client.build_url(self.SEARCH_ENDPOINT), params=dataset_case["params"]
         )
-        validator.validate_status_code(response, status_code)
-        validator.validate_error_message(response, expected_message)
+        validator.validate_status_code(response, dataset_case["status_code"])
+        validator.validate_error_message(response, dataset_case["expected_message"])